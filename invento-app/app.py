@@ -16,6 +16,8 @@ import logging
 import time
 import traceback
 import socket
+import uuid
+from itertools import zip_longest
 from werkzeug.security import generate_password_hash, check_password_hash
 from html import escape
 from functools import wraps
@@ -25,6 +27,7 @@ app = Flask(__name__)
 app.secret_key = os.urandom(32)  # Secure random key for production
 app.config["PERMANENT_SESSION_LIFETIME"] = 1800  # 30 minutes session timeout
 app.config["SESSION_PERMANENT"] = True
+app.config["MAX_CART_ITEMS"] = 100  # Line items accepted per cart submission
 
 # Configure CSRF protection
 csrf = CSRFProtect(app)
@@ -168,8 +171,10 @@ def init_db(first=False, retries=3, delay=2):
                         quantity INTEGER NOT NULL CHECK(quantity > 0),
                         status TEXT NOT NULL CHECK(status IN ('pending', 'approved', 'rejected')),
                         user_id INTEGER,
+                        order_id TEXT,
                         FOREIGN KEY (user_id) REFERENCES users(id))"""
                 )
+                ensure_requests_order_id(conn)
                 c.execute("SELECT COUNT(*) FROM inventory")
                 if c.fetchone()[0] == 0:
                     initial_inventory = [
@@ -219,6 +224,14 @@ def init_db(first=False, retries=3, delay=2):
     return False
 
 
+def ensure_requests_order_id(conn):
+    """Add the order_id column to requests tables created before carts existed."""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(requests)")]
+    if "order_id" not in columns:
+        conn.execute("ALTER TABLE requests ADD COLUMN order_id TEXT")
+        log_message(logging.INFO, "Added order_id column to requests table")
+
+
 def check_db_schema():
     try:
         with sqlite3.connect("inventory.db") as conn:
@@ -458,25 +471,48 @@ def delete_item(item_id):
         conn.close()
 
 
+SQLITE_MAX_INTEGER = 2**63 - 1  # Largest value SQLite can store in an INTEGER
+
+
+def validate_request_item(item_name, quantity):
+    """Validate one requested line item.
+
+    Returns (item_name, quantity, error) where error is None when the item is valid.
+    """
+    if not isinstance(item_name, str) or (
+        not isinstance(quantity, (str, int)) or isinstance(quantity, bool)
+    ):
+        log_message(logging.WARNING, "Missing or invalid fields for request")
+        return item_name, quantity, "Missing or invalid fields"
+    item_name = escape(item_name).strip()
+    if not item_name or quantity == "" or len(item_name) > 100:
+        log_message(logging.WARNING, "Missing or invalid fields for request")
+        return item_name, quantity, "Missing or invalid fields"
+    try:
+        quantity = int(quantity)
+    except ValueError:
+        log_message(logging.WARNING, f"Invalid quantity format: {quantity}")
+        return item_name, quantity, "Invalid quantity format"
+    if quantity <= 0:
+        log_message(logging.WARNING, f"Invalid quantity: {quantity}")
+        return item_name, quantity, "Quantity must be positive"
+    if quantity > SQLITE_MAX_INTEGER:
+        log_message(logging.WARNING, f"Quantity too large: {quantity}")
+        return item_name, quantity, "Invalid quantity"
+    return item_name, quantity, None
+
+
 @app.route("/requests", methods=["POST"])
 @require_login
 def add_request():
     if "user_id" not in session:
         log_message(logging.WARNING, "Unauthorized attempt to create request")
         return jsonify({"error": "Unauthorized"}), 403
-    item_name = escape(request.form.get("item_name")).strip()
-    quantity = request.form.get("quantity")
-    if not all([item_name, quantity]) or len(item_name) > 100:
-        log_message(logging.WARNING, "Missing or invalid fields for request")
-        return jsonify({"error": "Missing or invalid fields"}), 400
-    try:
-        quantity = int(quantity)
-        if quantity <= 0:
-            log_message(logging.WARNING, f"Invalid quantity: {quantity}")
-            return jsonify({"error": "Quantity must be positive"}), 400
-    except ValueError:
-        log_message(logging.WARNING, f"Invalid quantity format: {quantity}")
-        return jsonify({"error": "Invalid quantity format"}), 400
+    item_name, quantity, error = validate_request_item(
+        request.form.get("item_name"), request.form.get("quantity")
+    )
+    if error:
+        return jsonify({"error": error}), 400
     conn = get_db_connection()
     if not conn:
         log_message(logging.ERROR, "Database connection failed")
@@ -498,6 +534,75 @@ def add_request():
     finally:
         conn.close()
 
+
+@app.route("/requests/cart", methods=["POST"])
+@require_login
+def add_request_cart():
+    """Submit several requested items at once under a shared order ID.
+
+    Accepts JSON ({"items": [{"item_name": ..., "quantity": ...}, ...]}) or a
+    form with repeated item_name/quantity fields; blank form rows are skipped.
+    All items are inserted in a single transaction, or none are.
+    """
+    wants_json = request.is_json
+    if wants_json:
+        payload = request.get_json(silent=True) or {}
+        items = payload.get("items") if isinstance(payload, dict) else None
+        if not isinstance(items, list) or not all(
+            isinstance(item, dict) for item in items
+        ):
+            log_message(logging.WARNING, "Malformed cart payload")
+            return jsonify({"error": "Expected a list of items"}), 400
+        raw_items = [(item.get("item_name"), item.get("quantity")) for item in items]
+    else:
+        raw_items = [
+            (item_name, quantity)
+            for item_name, quantity in zip_longest(
+                request.form.getlist("item_name"),
+                request.form.getlist("quantity"),
+                fillvalue="",
+            )
+            if item_name.strip() or quantity.strip()
+        ]
+    if not raw_items:
+        log_message(logging.WARNING, "Empty cart submitted")
+        return jsonify({"error": "Cart is empty"}), 400
+    max_items = app.config["MAX_CART_ITEMS"]
+    if len(raw_items) > max_items:
+        log_message(logging.WARNING, f"Cart too large: {len(raw_items)} items")
+        return jsonify({"error": f"Cart cannot exceed {max_items} items"}), 400
+    order_id = uuid.uuid4().hex
+    rows = []
+    for line, (item_name, quantity) in enumerate(raw_items, start=1):
+        item_name, quantity, error = validate_request_item(item_name, quantity)
+        if error:
+            return jsonify({"error": f"Item {line}: {error}"}), 400
+        rows.append((item_name, quantity, "pending", session["user_id"], order_id))
+    conn = get_db_connection()
+    if not conn:
+        log_message(logging.ERROR, "Database connection failed")
+        return jsonify({"error": "Database error"}), 500
+    try:
+        with conn:
+            c = conn.cursor()
+            c.executemany(
+                "INSERT INTO requests (item_name, quantity, status, user_id, order_id) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        log_message(
+            logging.INFO, f"Added order {order_id} with {len(rows)} requested items"
+        )
+    except sqlite3.Error as e:
+        log_message(logging.ERROR, f"Cart submission failed: {str(e)}")
+        return jsonify({"error": f"Database error: {str(e)}"}), 500
+    finally:
+        conn.close()
+    if wants_json:
+        return jsonify({"order_id": order_id, "items": len(rows)}), 201
+    flash(f"Order submitted with {len(rows)} items", "success")
+    return redirect(url_for("index"))
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     return jsonify(status="ok"), 200
@@ -642,6 +747,7 @@ if __name__ == "__main__":
                             f"Database integrity check failed: {result}"
                         )
                     conn.execute("PRAGMA foreign_keys = ON")
+                    ensure_requests_order_id(conn)
                     log_message(logging.INFO, "Database integrity verified")
             app.run(host="0.0.0.0", port=port, debug=False)
         except Exception as e: